@@ -0,0 +1,53 @@
+# cython: language_level=3
+"""
+로컬 디렉터리 스캔 내부 루프 가속 모듈 (선택 사항)
+빌드: python setup.py build_ext --inplace
+빌드하지 않으면 main.py의 순수 Python 구현(_py_scan_directory)이 사용된다.
+"""
+
+import os
+
+from cpython.unicode cimport PyUnicode_FindChar
+
+
+_SCANDIR_SUPPORTS_FD = os.scandir in os.supports_fd and hasattr(os, 'O_DIRECTORY')
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+
+
+cpdef tuple scan_directory(str path, frozenset ext_set, bint collect):
+    """디렉터리 한 단계 스캔 (main._py_scan_directory와 동일한 동작)"""
+    cdef dict counts = {}
+    cdef Py_ssize_t total = 0
+    cdef list matched = []
+    cdef list subdirs = []
+    cdef str prefix, name, ext
+    cdef Py_ssize_t dot
+    cdef int fd
+
+    # main._scandir_at과 같이 디렉터리 fd 기준으로 scandir
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    fd = os.open(path, _OPEN_FLAGS) if _SCANDIR_SUPPORTS_FD else -1
+    try:
+        it = os.scandir(fd) if fd >= 0 else os.scandir(path)
+        with it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((prefix + entry.name, entry.stat(follow_symlinks=False)))
+                    continue
+                name = entry.name
+                dot = PyUnicode_FindChar(name, u'.', 0, len(name), -1)
+                if dot <= 0:
+                    continue
+                ext = name[dot:].lower()
+                if ext in ext_set:
+                    counts[ext] = counts.get(ext, 0) + 1
+                    total += 1
+                    if collect:
+                        matched.append(prefix + name)
+    finally:
+        if fd >= 0:
+            os.close(fd)
+
+    return counts, total, matched, subdirs
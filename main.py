@@ -8,19 +8,335 @@ import os
 import json
 import sys
 import argparse
-from pathlib import Path
-from typing import List, Dict, Tuple
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, redirect_stdout
+from functools import partial
+from typing import Callable, List, Dict, FrozenSet, Iterator, Optional, TextIO, Tuple
 import paramiko
+from paramiko.sftp import CMD_CLOSE, CMD_OPENDIR, CMD_READDIR, CMD_STATUS
 from tqdm import tqdm
 import stat
 
 
+# 하위 디렉터리가 이 개수를 넘을 때만 스레드 풀로 분산 (그 이하는 현재 스레드에서 처리)
+FANOUT_THRESHOLD = 4
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# SFTP 채널 하나에서 동시에 열어 두고 READDIR 요청을 진행시킬 원격 디렉터리 수
+SFTP_PIPELINE_WINDOW = 32
+# 항목이 많은 원격 디렉터리에 미리 보내 둘 READDIR 요청 수
+SFTP_READDIR_READAHEAD = 8
+# 대용량 디렉터리 목록이 적은 왕복으로 도착하도록 키운 SFTP 채널 윈도/패킷 크기
+SFTP_WINDOW_SIZE = 16 * 1024 * 1024
+SFTP_MAX_PACKET_SIZE = 256 * 1024
+# 디렉터리 fd 기반 scandir 지원 여부 (Linux 등 POSIX)
+_SCANDIR_SUPPORTS_FD = os.scandir in os.supports_fd and hasattr(os, 'O_DIRECTORY')
+_STAT_SUPPORTS_DIR_FD = os.stat in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+# 스캔 시작 시각과 이만큼 가까운(또는 이후의) mtime/ctime을 가진 디렉터리는 캐시하지 않음
+# (타임스탬프 해상도가 거친 파일시스템에서 같은 시각 안의 변경을 놓치지 않도록)
+DIR_CACHE_RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+@contextmanager
+def _scandir_at(path: str) -> Iterator[Iterator[os.DirEntry]]:
+    """디렉터리를 fd로 열어 scandir (가능한 플랫폼에서만)
+
+    fd 기반 scandir의 DirEntry.stat()은 fstatat(dirfd, name)으로 동작하므로
+    매번 전체 경로를 루트부터 다시 해석하지 않는다. 이 경우 DirEntry.path는
+    이름만 담기므로 호출 측에서 경로 접두어를 붙여야 한다.
+    """
+    if not _SCANDIR_SUPPORTS_FD:
+        with os.scandir(path) as it:
+            yield it
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        with os.scandir(fd) as it:
+            yield it
+    finally:
+        os.close(fd)
+
+
+def _py_scan_directory(path: str, ext_set: FrozenSet[str], collect: bool) -> Tuple[Dict[str, int], int, List[str], List[Tuple[str, os.stat_result]]]:
+    """디렉터리 한 단계 스캔 (확장자별 개수, 일치 수, 일치 경로, 하위 디렉터리)
+
+    _scan_fast.scan_directory의 순수 Python 구현. 심볼릭 링크는 건너뛰고,
+    하위 디렉터리는 (경로, lstat 결과) 형태로 반환한다.
+    일치한 확장자를 모아 Counter로 한 번에 집계한다.
+    """
+    batch = []
+    matched = []
+    subdirs = []
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    
+    with _scandir_at(path) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((prefix + entry.name, entry.stat(follow_symlinks=False)))
+                continue
+            name = entry.name
+            dot = name.rfind('.')
+            if dot <= 0:
+                continue
+            ext = name[dot:].lower()
+            if ext in ext_set:
+                batch.append(ext)
+                if collect:
+                    matched.append(prefix + name)
+    
+    return Counter(batch), len(batch), matched, subdirs
+
+
+def _py_scan_directory_single(path: str, ext: str, collect: bool) -> Tuple[Dict[str, int], int, List[str], List[Tuple[str, os.stat_result]]]:
+    """확장자가 하나일 때 사용하는 디렉터리 한 단계 스캔 (이름 끝 비교만 수행)
+
+    반환 형식은 _py_scan_directory와 같다.
+    """
+    n = len(ext)
+    found = 0
+    matched = []
+    subdirs = []
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    
+    with _scandir_at(path) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((prefix + entry.name, entry.stat(follow_symlinks=False)))
+                continue
+            name = entry.name
+            if len(name) > n and name[-n:].lower() == ext:
+                found += 1
+                if collect:
+                    matched.append(prefix + name)
+    
+    return ({ext: found} if found else {}), found, matched, subdirs
+
+
+# pipelined_walk가 사용하는 paramiko 비공개 API (requirements.txt에 고정한 버전 기준)
+_PARAMIKO_PRIVATE_API = (
+    (paramiko.SFTPClient, '_async_request'),
+    (paramiko.SFTPClient, '_read_response'),
+    (paramiko.SFTPClient, '_convert_status'),
+    (paramiko.SFTPAttributes, '_from_msg'),
+)
+
+
+def _check_paramiko_private_api() -> None:
+    """pipelined_walk에 필요한 paramiko 비공개 API가 있는지 확인"""
+    missing = [f"{cls.__name__}.{name}" for cls, name in _PARAMIKO_PRIVATE_API if not hasattr(cls, name)]
+    if missing:
+        raise RuntimeError(f"paramiko {paramiko.__version__}에 필요한 API가 없습니다: {', '.join(missing)} "
+                           "(requirements.txt의 버전 확인)")
+
+
+class _SFTPResponseInbox:
+    """SFTPClient._read_response가 전달하는 비동기 응답 수신함"""
+
+    def __init__(self):
+        self.responses = deque()
+
+    def _async_response(self, t, msg, num):
+        self.responses.append((num, t, msg))
+
+
+class _RemoteDir:
+    """pipelined_walk에서 열어 둔 원격 디렉터리 하나의 요청 상태"""
+
+    __slots__ = ('path', 'handle', 'outstanding', 'done')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handle = None
+        self.outstanding = 0
+        self.done = False
+
+
+def pipelined_walk(sftp: paramiko.SFTPClient, root: str, window: int = SFTP_PIPELINE_WINDOW,
+                   onerror: Optional[Callable[[str, OSError], None]] = None) -> Iterator[Tuple[str, Optional[List[paramiko.SFTPAttributes]]]]:
+    """SFTP 채널 하나에서 OPENDIR/READDIR 요청을 최대 window개 디렉터리만큼
+    동시에 보내 놓고 응답이 오는 대로 처리하는 너비 우선 원격 탐색
+
+    READDIR 응답마다 (디렉터리 경로, SFTPAttributes 목록)을 생성하고,
+    디렉터리 하나를 다 읽으면(또는 열지 못하면) (디렉터리 경로, None)을 생성한다.
+    하위 디렉터리(S_ISDIR, 심볼릭 링크 제외)는 자동으로 작업 목록에 추가된다.
+    첫 READDIR 응답 이후에는 listdir_iter처럼 디렉터리마다 최대
+    SFTP_READDIR_READAHEAD개의 READDIR을 미리 보내, 항목이 많은 디렉터리도
+    전체 목록을 기다리지 않고 도착하는 대로 처리한다.
+    paramiko의 비공개 API(_async_request, _read_response)를 사용한다.
+    """
+    _check_paramiko_private_api()
+    inbox = _SFTPResponseInbox()
+    pending = deque([root])
+    requests = {}
+    open_dirs = 0
+    
+    while pending or requests:
+        while pending and open_dirs < window:
+            remote_dir = _RemoteDir(pending.popleft())
+            requests[sftp._async_request(inbox, CMD_OPENDIR, remote_dir.path)] = (CMD_OPENDIR, remote_dir)
+            open_dirs += 1
+        
+        if not inbox.responses:
+            # waitfor 없이 호출하면 응답 하나를 읽어 _async_response로 넘기고 반환하므로,
+            # 그래도 비어 있으면 paramiko 내부 동작이 바뀐 것 (무한 대기 대신 오류)
+            sftp._read_response()
+            if not inbox.responses:
+                raise RuntimeError(f"paramiko {paramiko.__version__}의 SFTPClient._read_response가 "
+                                   "비동기 응답을 전달하지 않습니다 (requirements.txt의 버전 확인)")
+        num, t, msg = inbox.responses.popleft()
+        kind, remote_dir = requests.pop(num)
+        if kind == CMD_CLOSE:
+            continue
+        if kind == CMD_READDIR:
+            remote_dir.outstanding -= 1
+        
+        if t == CMD_STATUS:
+            # 첫 상태 응답(EOF 또는 오류)만 의미가 있고, 미리 보낸 나머지
+            # READDIR의 응답은 모두 회수한 뒤에 핸들을 닫는다
+            if not remote_dir.done:
+                remote_dir.done = True
+                try:
+                    sftp._convert_status(msg)
+                except EOFError:
+                    # 디렉터리 끝
+                    pass
+                except OSError as e:
+                    if onerror is not None:
+                        onerror(remote_dir.path, e)
+            if remote_dir.outstanding == 0:
+                if remote_dir.handle is not None:
+                    requests[sftp._async_request(inbox, CMD_CLOSE, remote_dir.handle)] = (CMD_CLOSE, remote_dir)
+                open_dirs -= 1
+                yield remote_dir.path, None
+            continue
+        
+        if kind == CMD_OPENDIR:
+            remote_dir.handle = msg.get_binary()
+            requests[sftp._async_request(inbox, CMD_READDIR, remote_dir.handle)] = (CMD_READDIR, remote_dir)
+            remote_dir.outstanding += 1
+            continue
+        
+        # 응답을 처리하는 동안 다음 항목들이 전송되도록 READDIR을 먼저 보충
+        if not remote_dir.done:
+            while remote_dir.outstanding < SFTP_READDIR_READAHEAD:
+                requests[sftp._async_request(inbox, CMD_READDIR, remote_dir.handle)] = (CMD_READDIR, remote_dir)
+                remote_dir.outstanding += 1
+        
+        path = remote_dir.path
+        prefix = path if path.endswith('/') else path + '/'
+        items = []
+        for _ in range(msg.get_int()):
+            filename = msg.get_text()
+            longname = msg.get_text()
+            attr = paramiko.SFTPAttributes._from_msg(msg, filename, longname)
+            if filename == '.' or filename == '..':
+                continue
+            items.append(attr)
+            if stat.S_ISDIR(attr.st_mode):
+                pending.append(prefix + filename)
+        yield path, items
+
+
+def _lstat_subdirs(path: str, names: List[str]) -> List[Tuple[str, os.stat_result]]:
+    """캐시된 하위 디렉터리 이름을 다시 lstat해 (경로, lstat 결과) 목록으로 변환
+
+    가능한 플랫폼에서는 부모 디렉터리를 한 번만 fd로 열고 fstatat(dirfd, name)으로
+    조회해 자식마다 전체 경로를 다시 해석하지 않는다. 부모를 열 수 없으면
+    OSError를 그대로 전파한다.
+    """
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    subdirs = []
+    if not _STAT_SUPPORTS_DIR_FD:
+        for name in names:
+            try:
+                subdirs.append((prefix + name, os.stat(prefix + name, follow_symlinks=False)))
+            except OSError:
+                continue
+        return subdirs
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for name in names:
+            try:
+                subdirs.append((prefix + name, os.stat(name, dir_fd=fd, follow_symlinks=False)))
+            except OSError:
+                continue
+    finally:
+        os.close(fd)
+    return subdirs
+
+
+try:
+    # python setup.py build_ext --inplace 로 빌드한 Cython 가속 모듈
+    from _scan_fast import scan_directory
+except ImportError:
+    scan_directory = _py_scan_directory
+
+
+class _LocalScanState:
+    """로컬 병렬 스캔 작업 스레드들이 공유하는 상태
+
+    확장자 집계는 스레드마다 별도의 Counter(threading.local)에 누적해
+    파일마다 잠금을 잡지 않도록 하고, 스캔이 끝난 뒤 한 번에 합친다.
+    이미 탐색한 디렉터리의 (st_dev, st_ino)는 seen에 기록해 바인드 마운트
+    등으로 다시 나타난 디렉터리를 건너뛴다.
+    cache가 주어지면 이전 실행의 (st_dev, st_ino) -> (st_mtime_ns, st_ctime_ns,
+    확장자별 개수, 일치 수, 하위 디렉터리 이름 목록)을 읽기 전용으로 참조하고,
+    이번 실행에서 방문한 디렉터리만 next_cache에 새로 기록한다. 따라서 삭제된
+    디렉터리의 항목은 다음 캐시로 넘어가지 않는다.
+    git의 racy-index 규칙처럼 scan_start 직전 DIR_CACHE_RACY_WINDOW_NS 이내에
+    바뀐 디렉터리는 같은 타임스탬프 안에서 다시 바뀌었을 수 있으므로 기록하지 않는다.
+    """
+
+    def __init__(self, cache: Optional[Dict[Tuple[int, int], tuple]] = None):
+        self.cache = cache
+        self.next_cache = {} if cache is not None else None
+        self.scan_start = time.time_ns()
+        self.seen = set()
+        # 중단(Ctrl-C 등) 시 작업 스레드가 남은 디렉터리를 버리고 빠져나오도록 하는 신호
+        self.stop = threading.Event()
+        self.tallies = []
+        self._seen_lock = threading.Lock()
+        self._tallies_lock = threading.Lock()
+        self._local = threading.local()
+
+    def tally(self) -> Counter:
+        """현재 스레드 전용 Counter (처음 호출 시 생성 및 등록)"""
+        counter = getattr(self._local, 'counter', None)
+        if counter is None:
+            counter = self._local.counter = Counter()
+            with self._tallies_lock:
+                self.tallies.append(counter)
+        return counter
+
+    def claim(self, subdirs: List[Tuple[str, os.stat_result]]) -> List[Tuple[str, os.stat_result]]:
+        """아직 탐색하지 않은 디렉터리만 골라 탐색 대상으로 등록"""
+        fresh = []
+        with self._seen_lock:
+            for subdir in subdirs:
+                st = subdir[1]
+                key = (st.st_dev, st.st_ino)
+                if key not in self.seen:
+                    self.seen.add(key)
+                    fresh.append(subdir)
+        return fresh
+
+
 class FileCounter:
     def __init__(self):
         """파일 카운터 초기화"""
         self.config = None
         self.ssh_client = None
         self.sftp_client = None
+        # 로컬 디렉터리 스캔 결과 캐시 (run을 반복 호출할 때 재사용)
+        self._dir_cache = {}
+        self._dir_cache_extensions = None
         
     def load_config(self, config_file: str) -> None:
         """설정 파일 로드"""
@@ -28,6 +344,7 @@ class FileCounter:
             with open(config_file, 'r', encoding='utf-8') as f:
                 self.config = json.load(f)
             self.validate_config()
+            self.config['extensions'] = self.normalize_extensions(self.config['extensions'])
         except FileNotFoundError:
             print(f"설정 파일을 찾을 수 없습니다: {config_file}")
             sys.exit(1)
@@ -54,6 +371,12 @@ class FileCounter:
                 if key not in self.config:
                     raise ValueError(f"SSH 연결을 위한 필수 키가 없습니다: {key}")
     
+    @staticmethod
+    def normalize_extensions(extensions: List[str]) -> List[str]:
+        """확장자를 소문자 + 선행 '.' 형태로 정규화 (중복 제거, 순서 유지)"""
+        normalized = (ext.lower() if ext.startswith('.') else f".{ext.lower()}" for ext in extensions)
+        return list(dict.fromkeys(normalized))
+    
     def connect_ssh(self) -> None:
         """SSH 연결 설정"""
         try:
@@ -68,7 +391,11 @@ class FileCounter:
                 port=self.config.get('port', 22)
             )
             
-            self.sftp_client = self.ssh_client.open_sftp()
+            self.sftp_client = paramiko.SFTPClient.from_transport(
+                self.ssh_client.get_transport(),
+                window_size=SFTP_WINDOW_SIZE,
+                max_packet_size=SFTP_MAX_PACKET_SIZE
+            )
             print("SSH 연결 성공!")
             
         except Exception as e:
@@ -82,107 +409,205 @@ class FileCounter:
         if self.ssh_client:
             self.ssh_client.close()
     
-    def count_directories_local(self, directory: str) -> int:
-        """로컬 디렉터리 개수 카운트 (진행률 표시용)"""
-        count = 0
-        try:
-            for root, dirs, files in os.walk(directory):
-                count += 1
-        except PermissionError:
-            pass
-        return count
-    
-    def count_directories_ssh(self, directory: str) -> int:
-        """SSH 디렉터리 개수 카운트 (진행률 표시용)"""
-        count = 0
-        
-        def recursive_count(path):
-            nonlocal count
-            try:
-                count += 1
-                for item in self.sftp_client.listdir_attr(path):
-                    if stat.S_ISDIR(item.st_mode):
-                        item_path = f"{path}/{item.filename}" if path != "/" else f"/{item.filename}"
-                        recursive_count(item_path)
-            except (PermissionError, FileNotFoundError, OSError):
-                pass
-        
-        recursive_count(directory)
-        return count
-    
-    def count_files_local(self, directory: str, extensions: List[str]) -> Tuple[Dict[str, int], int]:
-        """로컬 파일시스템에서 파일 카운트"""
-        file_counts = {ext: 0 for ext in extensions}
-        total_files = 0
+    def _walk_local_subtree(self, root: Tuple[str, Optional[os.stat_result]], scan: Callable[[str], tuple],
+                            state: _LocalScanState) -> Tuple[List[str], int, List[Tuple[str, os.stat_result]]]:
+        """로컬 하위 트리 스캔 (스레드 풀 작업 단위)
+
+        root는 (경로, lstat 결과)이고, scan은 디렉터리 한 단계를 스캔하는
+        함수(scan_directory 등)이다.
+        하위 디렉터리가 FANOUT_THRESHOLD개를 넘으면 스레드 풀에 다시 제출하도록
+        반환하고, 그 이하이면 현재 스레드에서 이어서 탐색한다.
+        확장자별 개수는 현재 스레드 전용 Counter에 누적한다.
+        mtime/ctime이 바뀌지 않은 디렉터리는 캐시된 결과를 사용하고 다시 읽지 않는다.
+        """
+        file_counts = state.tally()
+        cache = state.cache
+        next_cache = state.next_cache
+        racy_after = state.scan_start - DIR_CACHE_RACY_WINDOW_NS
         file_list = []
+        dirs_scanned = 0
+        spawn = []
+        stack = [root]
+        
+        while stack and not state.stop.is_set():
+            path, st = stack.pop()
+            key = (st.st_dev, st.st_ino) if st is not None else None
+            cached = cache.get(key) if cache is not None and key is not None else None
+            # chmod 등 내용 외 변경은 ctime에만 반영되므로 mtime과 함께 비교
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_ctime_ns:
+                _, _, counts, found, names = cached
+                matched = []
+                try:
+                    subdirs = _lstat_subdirs(path, names)
+                except OSError:
+                    continue
+            else:
+                try:
+                    counts, found, matched, subdirs = scan(path)
+                except OSError:
+                    # os.walk와 동일하게 접근할 수 없는 디렉터리는 건너뜀
+                    continue
+                cached = (st.st_mtime_ns, st.st_ctime_ns, counts, found,
+                          [os.path.basename(subdir) for subdir, _ in subdirs]) if key is not None else None
+            if next_cache is not None and cached is not None and max(st.st_mtime_ns, st.st_ctime_ns) < racy_after:
+                next_cache[key] = cached
+            
+            if found:
+                file_counts.update(counts)
+            file_list.extend(matched)
+            dirs_scanned += 1
+            
+            subdirs = state.claim(subdirs)
+            if len(subdirs) > FANOUT_THRESHOLD:
+                spawn.extend(subdirs)
+            else:
+                stack.extend(subdirs)
         
-        # 총 디렉터리 수 계산
-        total_dirs = self.count_directories_local(directory)
+        return file_list, dirs_scanned, spawn
+
+    @staticmethod
+    def _select_local_scan(extensions: List[str], collect: bool) -> Callable[[str], tuple]:
+        """확장자 개수에 맞게 특화된 디렉터리 스캔 함수 선택
+
+        1개: 이름 끝 비교 (Cython 모듈이 빌드되어 있으면 그쪽을 우선 사용)
+        그 외: 집합 조회
+        이름 끝 비교는 확장자에 '.'이 하나뿐일 때만 마지막 '.' 기준 판별과
+        결과가 같으므로, '.tar.gz' 같은 확장자는 집합 조회로 처리한다.
+        """
+        if len(extensions) == 1 and extensions[0].count('.') == 1 and scan_directory is _py_scan_directory:
+            return partial(_py_scan_directory_single, ext=extensions[0], collect=collect)
+        return partial(scan_directory, ext_set=frozenset(extensions), collect=collect)
+
+    def count_files_local(self, directory: str, extensions: List[str],
+                          output: Optional[TextIO] = None) -> Tuple[Dict[str, int], int]:
+        """로컬 파일시스템에서 파일 카운트 (스레드 풀 병렬 스캔)
+
+        output이 주어지면 일치한 파일 경로를 한 줄씩 기록한다.
+        """
+        collect = output is not None
+        scan = self._select_local_scan(extensions, collect)
+        # 경로 목록을 기록할 때는 모든 디렉터리를 실제로 읽어야 하므로 캐시 미사용,
+        # 확장자 구성이 바뀌면 캐시된 개수는 쓸 수 없으므로 빈 캐시에서 시작
+        if collect:
+            state = _LocalScanState()
+        elif self._dir_cache_extensions == tuple(extensions):
+            state = _LocalScanState(self._dir_cache)
+        else:
+            state = _LocalScanState({})
+        try:
+            root = (directory, os.stat(directory))
+            state.claim([root])
+        except OSError:
+            root = (directory, None)
         
-        with tqdm(total=total_dirs, desc="디렉터리 스캔 중", unit="dirs") as pbar:
+        # 사전 디렉터리 카운트 없이 단일 패스로 스캔
+        with tqdm(desc="디렉터리 스캔 중", unit="dirs", bar_format="{desc}: {n} dirs") as pbar, \
+                ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
             try:
-                for root, dirs, files in os.walk(directory):
-                    pbar.update(1)
-                    for file in files:
-                        file_ext = Path(file).suffix.lower()
-                        if file_ext in extensions:
-                            file_counts[file_ext] += 1
-                            total_files += 1
-
-                            full_path = Path(root)/file
-                            file_list.append(str(full_path))
-            except PermissionError as e:
-                print(f"권한 오류: {e}")
+                # 완료된 작업을 콜백으로 큐에 받아, 대기 작업이 많아도 완료마다 O(1)로 처리
+                completed = queue.SimpleQueue()
+                pool.submit(self._walk_local_subtree, root, scan, state).add_done_callback(completed.put)
+                outstanding = 1
+                while outstanding:
+                    future = completed.get()
+                    outstanding -= 1
+                    paths, scanned, spawn = future.result()
+                    if paths:
+                        output.writelines(f"{path}\n" for path in paths)
+                    pbar.update(scanned)
+                    for subdir in spawn:
+                        pool.submit(self._walk_local_subtree, subdir, scan, state).add_done_callback(completed.put)
+                    outstanding += len(spawn)
+                
+                # 끝까지 스캔한 경우에만 이번 실행에서 방문한 디렉터리로 캐시 교체
+                if state.next_cache is not None:
+                    self._dir_cache = state.next_cache
+                    self._dir_cache_extensions = tuple(extensions)
             except Exception as e:
                 print(f"오류 발생: {e}")
+            except BaseException:
+                # KeyboardInterrupt 등: 대기 중인 작업은 취소하고 실행 중인 작업은
+                # 현재 디렉터리까지만 처리하게 한 뒤 전파
+                state.stop.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
         
-        return file_counts, total_files, file_list
+        # 스레드 풀 종료 후 스레드별 Counter 병합
+        file_counts = sum(state.tallies, Counter())
+        return {ext: file_counts[ext] for ext in extensions}, sum(file_counts.values())
     
-    def count_files_ssh(self, directory: str, extensions: List[str]) -> Tuple[Dict[str, int], int]:
-        """SSH를 통한 원격 파일시스템에서 파일 카운트"""
-        file_counts = {ext: 0 for ext in extensions}
+    def count_files_ssh(self, directory: str, extensions: List[str],
+                        output: Optional[TextIO] = None) -> Tuple[Dict[str, int], int]:
+        """SSH를 통한 원격 파일시스템에서 파일 카운트
+
+        pipelined_walk로 SFTP_PIPELINE_WINDOW개 디렉터리의 READDIR 요청을
+        한 채널에서 동시에 진행시켜 디렉터리마다 왕복 지연을 기다리지 않도록 한다.
+        output이 주어지면 일치한 파일 경로를 한 줄씩 기록한다.
+        """
+        file_counts = Counter()
         total_files = 0
-        file_list = []
+        ext_set = frozenset(extensions)
         
-        # 총 디렉터리 수 계산
-        total_dirs = self.count_directories_ssh(directory)
+        def report_error(path, e):
+            print(f"\n경고: {path} 접근 불가 - {e}")
         
-        def recursive_search(path, pbar):
-            nonlocal file_counts, total_files
-            try:
-                pbar.update(1)
-                for item in self.sftp_client.listdir_attr(path):
-                    item_path = f"{path}/{item.filename}" if path != "/" else f"/{item.filename}"
-                    
-                    if stat.S_ISDIR(item.st_mode):
-                        # 디렉터리인 경우 재귀 호출
-                        recursive_search(item_path, pbar)
-                    else:
-                        # 파일인 경우 확장자 확인
-                        file_ext = Path(item.filename).suffix.lower()
-                        if file_ext in extensions:
-                            file_counts[file_ext] += 1
-                            total_files += 1
-
-                            file_list.append(item_path)
-                            
-            except (PermissionError, FileNotFoundError, OSError) as e:
-                print(f"\n경고: {path} 접근 불가 - {e}")
-        
-        with tqdm(total=total_dirs, desc="원격 디렉터리 스캔 중", unit="dirs") as pbar:
-            recursive_search(directory, pbar)
-        
-        return file_counts, total_files, file_list
+        with tqdm(desc="원격 디렉터리 스캔 중", unit="dirs", bar_format="{desc}: {n} dirs") as pbar:
+            for path, items in pipelined_walk(self.sftp_client, directory, onerror=report_error):
+                if items is None:
+                    pbar.update(1)
+                    continue
+                
+                batch = []
+                matched = []
+                prefix = path if path.endswith('/') else path + '/'
+                for item in items:
+                    mode = item.st_mode
+                    if stat.S_ISLNK(mode) or stat.S_ISDIR(mode):
+                        # 디렉터리는 pipelined_walk가 탐색하고, 심볼릭 링크는
+                        # 순환 및 중복 집계를 막기 위해 건너뜀
+                        continue
+                    # 파일인 경우 확장자 확인
+                    name = item.filename
+                    dot = name.rfind('.')
+                    file_ext = name[dot:].lower() if dot > 0 else ''
+                    if file_ext in ext_set:
+                        batch.append(file_ext)
+                        if output is not None:
+                            matched.append(f"{prefix}{name}\n")
+                
+                if matched:
+                    output.writelines(matched)
+                file_counts.update(batch)
+                total_files += len(batch)
+        
+        return {ext: file_counts[ext] for ext in extensions}, total_files
+    
+    def run(self, config_file: str = "config.json", output_file: Optional[str] = None) -> bool:
+        """메인 실행 함수
+
+        output_file(또는 설정의 output_file)이 지정되면 일치한 파일 경로를
+        메모리에 모으지 않고 해당 파일로 바로 기록한다. '-'이면 표준 출력에 기록하고,
+        안내 문구와 결과 표는 표준 에러로 보내 표준 출력에는 경로만 남긴다.
+        사용자가 중단(Ctrl-C)하면 False를 반환한다.
+        """
+        # 설정 파일 로드
+        self.load_config(config_file)
+        output_file = output_file or self.config.get('output_file')
+        
+        if output_file != '-':
+            return self._run(output_file, None)
+        # 경로 목록을 표준 출력에 쓸 때는 연결 메시지, 경고 등 나머지 print도
+        # 표준 에러로 돌려 파이프로 받는 쪽에 경로만 전달되도록 함
+        paths_out = sys.stdout
+        with redirect_stdout(sys.stderr):
+            return self._run(output_file, paths_out)
     
-    def run(self, config_file: str = "config.json") -> None:
-        """메인 실행 함수"""
+    def _run(self, output_file: Optional[str], paths_out: Optional[TextIO]) -> bool:
+        """설정이 로드된 상태에서 스캔을 실행하고 결과 출력 (paths_out: '-'일 때의 표준 출력)"""
         print("=" * 60)
         print("파일 카운터 애플리케이션 시작")
         print("=" * 60)
         
-        # 설정 파일 로드
-        self.load_config(config_file)
-        
         connection_type = self.config['connection_type']
         directory = self.config['directory']
         extensions = self.config['extensions']
@@ -190,15 +615,24 @@ class FileCounter:
         print(f"연결 타입: {connection_type}")
         print(f"대상 디렉터리: {directory}")
         print(f"검색할 확장자: {', '.join(extensions)}")
+        if output_file:
+            print(f"파일 목록 출력: {output_file}")
         print("-" * 60)
         
         try:
-            if connection_type == 'ssh':
-                self.connect_ssh()
-                file_counts, total_files, file_list = self.count_files_ssh(directory, extensions)
-                self.disconnect_ssh()
-            else:
-                file_counts, total_files, file_list = self.count_files_local(directory, extensions)
+            with ExitStack() as stack:
+                if output_file == '-':
+                    output = paths_out
+                elif output_file:
+                    output = stack.enter_context(open(output_file, 'w', encoding='utf-8'))
+                else:
+                    output = None
+                if connection_type == 'ssh':
+                    self.connect_ssh()
+                    file_counts, total_files = self.count_files_ssh(directory, extensions, output)
+                    self.disconnect_ssh()
+                else:
+                    file_counts, total_files = self.count_files_local(directory, extensions, output)
             
             # 결과 출력
             print("\n" + "=" * 60)
@@ -211,15 +645,17 @@ class FileCounter:
             print("-" * 60)
             print(f"{'총 파일 수':>15} : {total_files:>8,}개")
             print("=" * 60)
-            print("file_list = ", file_list)
             
         except KeyboardInterrupt:
             print("\n\n프로그램이 사용자에 의해 중단되었습니다.")
+            return False
         except Exception as e:
             print(f"\n오류 발생: {e}")
         finally:
             if connection_type == 'ssh':
                 self.disconnect_ssh()
+        
+        return True
 
 
 def main():
@@ -230,12 +666,28 @@ def main():
         default='config.json',
         help='설정 파일 경로 (기본값: config.json)'
     )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help="일치한 파일 경로를 기록할 파일, '-'이면 표준 출력 (설정의 output_file보다 우선)"
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='스캔 반복 횟수 (기본값: 1, 2 이상이면 PyPy 실행 권장)'
+    )
     
     args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat는 1 이상이어야 합니다.")
     
     # 파일 카운터 실행
     counter = FileCounter()
-    counter.run(args.config)
+    for _ in range(args.repeat):
+        if not counter.run(args.config, args.output):
+            # 중단되면 남은 반복도 실행하지 않음
+            break
 
 
 if __name__ == "__main__":
@@ -0,0 +1,17 @@
+"""
+선택 사항인 Cython 가속 모듈(_scan_fast) 빌드 스크립트
+사용법: python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+
+setup(
+    name="directory_scanner",
+    py_modules=["main"],
+    ext_modules=cythonize(
+        ["_scan_fast.pyx"],
+        compiler_directives={'boundscheck': False, 'wraparound': False},
+    ),
+)
@@ -0,0 +1,160 @@
+"""
+pipelined_walk / count_files_ssh 검증
+
+socket.socketpair() 위에 프로세스 내 SFTP 서버를 띄워 원격 스캔 결과가
+로컬 스캔 결과와 같은지 확인한다. pipelined_walk는 paramiko의 비공개 API를
+사용하므로, requirements.txt에 고정한 버전을 올렸을 때 동작이 바뀌면
+멈춰 있지 않고 이 테스트가 제한 시간 안에 실패해야 한다.
+
+실행: python -m unittest discover -s tests
+"""
+
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+import paramiko
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import FileCounter  # noqa: E402
+
+# 원격 스캔 한 번에 허용하는 최대 시간 (초)
+SCAN_TIMEOUT = 30
+EXTENSIONS = ['.txt', '.pdf', '.gz']
+
+
+class _StubServer(paramiko.ServerInterface):
+    """모든 비밀번호 인증과 세션 채널을 허용하는 테스트용 SSH 서버"""
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+
+class _StubSFTPServer(paramiko.SFTPServerInterface):
+    """ROOT 아래 로컬 디렉터리를 그대로 보여주는 읽기 전용 SFTP 서버"""
+
+    ROOT = ''
+
+    def _realpath(self, path):
+        return self.ROOT + self.canonicalize(path)
+
+    def list_folder(self, path):
+        path = self._realpath(path)
+        try:
+            out = []
+            for name in os.listdir(path):
+                attr = paramiko.SFTPAttributes.from_stat(os.lstat(os.path.join(path, name)))
+                attr.filename = name
+                out.append(attr)
+            return out
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._realpath(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def lstat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(self._realpath(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+
+class PipelinedWalkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        cls._make_tree(cls.root)
+        _StubSFTPServer.ROOT = cls.root
+
+        server_sock, client_sock = socket.socketpair()
+        cls.server = paramiko.Transport(server_sock)
+        cls.server.add_server_key(paramiko.RSAKey.generate(2048))
+        cls.server.set_subsystem_handler('sftp', paramiko.SFTPServer, _StubSFTPServer)
+        # start_server는 협상이 끝날 때까지 막히므로 클라이언트 연결과 동시에 진행
+        server_thread = threading.Thread(target=cls.server.start_server, kwargs={'server': _StubServer()}, daemon=True)
+        server_thread.start()
+        cls.client = paramiko.Transport(client_sock)
+        cls.client.connect(username='test', password='test')
+        server_thread.join(SCAN_TIMEOUT)
+
+        cls.counter = FileCounter()
+        cls.counter.sftp_client = paramiko.SFTPClient.from_transport(cls.client)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.counter.sftp_client.close()
+        cls.client.close()
+        cls.server.close()
+        shutil.rmtree(cls.root)
+
+    @staticmethod
+    def _make_tree(root):
+        """중첩 디렉터리, 항목이 많은 디렉터리(READDIR 미리 요청), 심볼릭 링크를 포함한 트리 생성"""
+        def touch(*parts):
+            with open(os.path.join(root, *parts), 'w'):
+                pass
+
+        os.makedirs(os.path.join(root, 'a', 'b', 'c'))
+        os.makedirs(os.path.join(root, 'empty'))
+        os.makedirs(os.path.join(root, 'big'))
+        touch('x.txt')
+        touch('Y.TXT')
+        touch('.hidden.txt')
+        touch('a', '1.pdf')
+        touch('a', 'b', 'archive.tar.gz')
+        touch('a', 'b', 'c', '2.txt')
+        touch('a', 'b', 'c', 'noext')
+        for i in range(2000):
+            touch('big', f"{i}.txt" if i % 3 else f"{i}.pdf")
+        for i in range(40):
+            os.makedirs(os.path.join(root, 'a', f"d{i}"))
+            touch('a', f"d{i}", 'z.txt')
+        os.symlink(os.path.join(root, 'a'), os.path.join(root, 'link_dir'))
+        os.symlink(os.path.join(root, 'x.txt'), os.path.join(root, 'link.txt'))
+
+    def _count_ssh(self, directory):
+        """count_files_ssh를 별도 스레드에서 실행하고 제한 시간을 넘기면 실패"""
+        result = {}
+
+        def target():
+            try:
+                result['value'] = self.counter.count_files_ssh(directory, EXTENSIONS)
+            except BaseException as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(SCAN_TIMEOUT)
+        if thread.is_alive():
+            self.fail(f"count_files_ssh가 {SCAN_TIMEOUT}초 안에 끝나지 않았습니다 "
+                      f"(paramiko {paramiko.__version__} 비공개 API 동작 확인)")
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    def test_matches_local_counts(self):
+        local = FileCounter().count_files_local(self.root, EXTENSIONS)
+        self.assertEqual(local[1], 2046)
+        self.assertEqual(self._count_ssh('/'), local)
+        self.assertEqual(self._count_ssh('/a'), FileCounter().count_files_local(os.path.join(self.root, 'a'), EXTENSIONS))
+
+    def test_missing_root(self):
+        self.assertEqual(self._count_ssh('/missing'), ({ext: 0 for ext in EXTENSIONS}, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()